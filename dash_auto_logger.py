@@ -11,6 +11,9 @@ import requests
 import time
 import os
 import base64
+import sqlite3
+import tempfile
+import threading
 from keycloak import KeycloakOpenID
 import dash_enterprise_auth as auth
 from dotenv import load_dotenv
@@ -18,6 +21,28 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+# Host-wide SQLite file used to coordinate heartbeats between worker processes
+DEFAULT_DEDUPE_DB_PATH = os.environ.get(
+    "AUTO_LOGGER_DEDUPE_DB",
+    os.path.join(tempfile.gettempdir(), "dash_auto_logger.sqlite3")
+)
+
+# How much earlier than a full interval a user's next heartbeat may be sent, so timer
+# jitter on a single tab never drops a real heartbeat. Never more than half an interval.
+DEDUPE_JITTER_ALLOWANCE_MS = 500
+
+# Claims older than this are pruned, at most once per prune interval per process
+DEDUPE_RETENTION_SECONDS = 3600
+DEDUPE_PRUNE_INTERVAL_SECONDS = 60
+
+# One connection per database file per process, reopened after a fork
+_dedupe_connections = {}
+# Connections inherited across fork() must not be used or closed in the child,
+# so they are kept referenced here instead of being garbage-collected
+_dedupe_inherited_connections = []
+_dedupe_last_prune = {}
+_dedupe_lock = threading.Lock()
+
 def get_keycloak_tokens():
     """Get Keycloak tokens for authentication"""
     try:
@@ -49,7 +74,146 @@ def get_keycloak_tokens():
         print(f"[AUTO-LOGGER] Error getting Keycloak tokens: {e}")
         return None
 
-def add_auto_logging_feature(app, server_url="https://tam.plotly.host/listener-app", interval_seconds=3):
+def _get_dedupe_db(db_path):
+    """Returns this process's connection to the dedupe database, creating the schema on first use"""
+    pid = os.getpid()
+    cached = _dedupe_connections.get(db_path)
+    if cached:
+        if cached[0] == pid:
+            return cached[1]
+        _dedupe_inherited_connections.append(cached[1])
+
+    conn = sqlite3.connect(db_path, timeout=1, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS heartbeat_claims ("
+        "app_name TEXT NOT NULL, "
+        "username TEXT NOT NULL, "
+        "last_sent_ms INTEGER NOT NULL, "
+        "PRIMARY KEY (app_name, username))"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS heartbeat_claims_last_sent "
+        "ON heartbeat_claims (app_name, last_sent_ms)"
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS heartbeat_stats ("
+        "app_name TEXT PRIMARY KEY, "
+        "suppressed INTEGER NOT NULL DEFAULT 0)"
+    )
+    _dedupe_connections[db_path] = (pid, conn)
+    return conn
+
+def claim_heartbeat_window(db_path, app_name, username, now_ms, interval_seconds):
+    """
+    Claims the current heartbeat window for (app_name, username) on behalf of the calling worker.
+
+    A window opens once the interval, less DEDUPE_JITTER_ALLOWANCE_MS, has elapsed since
+    the last heartbeat claimed for that user by any worker on the host. The first worker
+    to claim it should send; every other worker gets False and the app's suppressed
+    counter is incremented. Measuring the gap from the last claim, rather than using
+    wall-clock buckets, means a single tab is never suppressed by timer jitter, and
+    several tabs still produce one heartbeat per interval. State lives in a SQLite
+    file, so it is shared by all workers and survives worker restarts.
+
+    Anonymous users (username None) can't be told apart, so they are never deduplicated.
+
+    Args:
+        db_path: Path to the host-wide SQLite file
+        app_name: The app's pathname prefix
+        username: The logged-in user
+        now_ms: Current time in milliseconds
+        interval_seconds: The app's logging interval
+
+    Returns:
+        True if the caller should send the heartbeat, False otherwise
+    """
+    if username is None:
+        return True
+
+    interval_ms = int(interval_seconds * 1000)
+    min_gap_ms = max(interval_ms - DEDUPE_JITTER_ALLOWANCE_MS, interval_ms // 2)
+    try:
+        with _dedupe_lock:
+            conn = _get_dedupe_db(db_path)
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Only a primary key conflict is tolerated, any other constraint error raises
+                claimed = conn.execute(
+                    "INSERT INTO heartbeat_claims (app_name, username, last_sent_ms) VALUES (?, ?, ?) "
+                    "ON CONFLICT(app_name, username) DO UPDATE SET last_sent_ms = excluded.last_sent_ms "
+                    "WHERE heartbeat_claims.last_sent_ms <= excluded.last_sent_ms - ?",
+                    (app_name, username, now_ms, min_gap_ms)
+                ).rowcount == 1
+
+                # Counted as soon as another worker holds the window, so this also
+                # includes heartbeats lost when the claiming worker's send fails
+                if not claimed:
+                    conn.execute(
+                        "INSERT INTO heartbeat_stats (app_name, suppressed) VALUES (?, 1) "
+                        "ON CONFLICT(app_name) DO UPDATE SET suppressed = suppressed + 1",
+                        (app_name,)
+                    )
+
+                prune_key = (db_path, app_name)
+                if claimed and now_ms - _dedupe_last_prune.get(prune_key, 0) >= DEDUPE_PRUNE_INTERVAL_SECONDS * 1000:
+                    conn.execute(
+                        "DELETE FROM heartbeat_claims WHERE app_name = ? AND last_sent_ms < ?",
+                        (app_name, now_ms - DEDUPE_RETENTION_SECONDS * 1000)
+                    )
+                    _dedupe_last_prune[prune_key] = now_ms
+
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return claimed
+
+    except Exception as e:
+        # Fail open: a duplicate heartbeat is better than a missing one
+        print(f"[AUTO-LOGGER] Error claiming heartbeat window: {e}")
+        return True
+
+def release_heartbeat_window(db_path, app_name, username, now_ms):
+    """
+    Gives back a window claimed at now_ms after a failed send.
+
+    Other workers' heartbeats for that window have usually been suppressed already,
+    so this only lets the next tick from any worker send without waiting a full interval.
+    """
+    try:
+        with _dedupe_lock:
+            conn = _get_dedupe_db(db_path)
+            conn.execute(
+                "DELETE FROM heartbeat_claims WHERE app_name = ? AND username = ? AND last_sent_ms = ?",
+                (app_name, username, now_ms)
+            )
+
+    except Exception as e:
+        print(f"[AUTO-LOGGER] Error releasing heartbeat window: {e}")
+
+def get_suppressed_count(db_path, app_name):
+    """
+    Returns how many heartbeats were suppressed on this host for an app.
+
+    Includes heartbeats suppressed for a window whose claiming worker then failed to send.
+    """
+    try:
+        with _dedupe_lock:
+            conn = _get_dedupe_db(db_path)
+            row = conn.execute(
+                "SELECT suppressed FROM heartbeat_stats WHERE app_name = ?",
+                (app_name,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    except Exception as e:
+        print(f"[AUTO-LOGGER] Error reading suppressed count: {e}")
+        return 0
+
+def add_auto_logging_feature(app, server_url="https://tam.plotly.host/listener-app", interval_seconds=3,
+                             dedupe_db_path=DEFAULT_DEDUPE_DB_PATH):
     """
     Adds interval-based logging to a Dash app.
     
@@ -57,6 +221,9 @@ def add_auto_logging_feature(app, server_url="https://tam.plotly.host/listener-a
         app: The Dash app instance
         server_url: URL of the server app to send data to
         interval_seconds: How often to send data (in seconds)
+        dedupe_db_path: SQLite file shared by all workers on the host so only one
+            heartbeat per user and interval window is sent. A window whose send fails
+            is released so the next tick can send. None disables deduplication.
     
     Returns:
         None (modifies the app in-place)
@@ -78,22 +245,32 @@ def add_auto_logging_feature(app, server_url="https://tam.plotly.host/listener-a
     )
     def send_log_data(n_intervals):
         if n_intervals > 0:
-            _send_log_data(app, server_url)
+            _send_log_data(app, server_url, interval_seconds, dedupe_db_path)
         return n_intervals
 
-def _send_log_data(app, server_url):
+def _send_log_data(app, server_url, interval_seconds=3, dedupe_db_path=None):
     """Core function to send log data to the receiver"""
+    claimed = False
+    sent = False
     try:
+        # Generate data to send
+        app_name = app.config.requests_pathname_prefix
+        username = auth.get_username()
+        now_ms = int(time.time() * 1000)
+        timestamp = str(now_ms)
+
+        # Only the first worker on this host sends each window's heartbeat.
+        # Anonymous requests can't be told apart, so they are always sent.
+        if dedupe_db_path and username is not None:
+            claimed = claim_heartbeat_window(dedupe_db_path, app_name, username, now_ms, interval_seconds)
+            if not claimed:
+                return
+
         # Get Keycloak tokens for authentication
         tokens = get_keycloak_tokens()
         if not tokens:
             print(f"[AUTO-LOGGER] Failed to get authentication tokens")
             return
-
-        # Generate data to send
-        app_name = app.config.requests_pathname_prefix
-        username = auth.get_username()
-        timestamp = str(int(time.time() * 1000))
         
         data = {
             "app_name": app_name,
@@ -127,12 +304,18 @@ def _send_log_data(app, server_url):
         
         if response.status_code == 200:
             print(f"[AUTO-LOGGER] Successfully sent: {username} at {timestamp} for {app_name}")
+            sent = True
         else:
             print(f"[AUTO-LOGGER] Failed to send data. Status: {response.status_code}")
             
     except Exception as e:
         print(f"[AUTO-LOGGER] Error sending log data: {e}")
 
+    finally:
+        # Hand the window back so the next tick doesn't wait a full interval
+        if claimed and not sent:
+            release_heartbeat_window(dedupe_db_path, app_name, username, now_ms)
+
 # Convenience function for quick setup
 def setup_auto_logging(app, **kwargs):
     """
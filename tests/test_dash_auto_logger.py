@@ -0,0 +1,131 @@
+import multiprocessing
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+import dash_auto_logger as dal
+
+
+def _claim_in_worker(db_path, barrier, results, now_ms):
+    barrier.wait()
+    results.put(dal.claim_heartbeat_window(db_path, "/app/", "alice", now_ms, 3))
+
+
+def _count_claims(db_path, app_name):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(
+            "SELECT COUNT(*) FROM heartbeat_claims WHERE app_name = ?", (app_name,)
+        ).fetchone()[0]
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "dedupe.sqlite3")
+
+
+def test_only_one_worker_wins_a_window(db_path):
+    try:
+        ctx = multiprocessing.get_context("fork")
+    except ValueError:
+        pytest.skip("fork start method not available")
+
+    workers = 8
+    barrier = ctx.Barrier(workers)
+    results = ctx.Queue()
+    processes = [
+        ctx.Process(target=_claim_in_worker, args=(db_path, barrier, results, 1_000_000))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=30)
+        assert process.exitcode == 0
+
+    claims = [results.get(timeout=5) for _ in range(workers)]
+    assert claims.count(True) == 1
+    assert dal.get_suppressed_count(db_path, "/app/") == workers - 1
+
+
+def test_next_window_opens_after_min_gap(db_path):
+    assert dal.claim_heartbeat_window(db_path, "/app/", "alice", 0, 3)
+    # Second tab ticking one second later is a duplicate
+    assert not dal.claim_heartbeat_window(db_path, "/app/", "alice", 1000, 3)
+    # A single tab's next tick arriving slightly early is still sent
+    assert dal.claim_heartbeat_window(db_path, "/app/", "alice", 2900, 3)
+    assert dal.get_suppressed_count(db_path, "/app/") == 1
+
+
+def test_staggered_tabs_send_one_heartbeat_per_interval(db_path):
+    interval_ms = 3000
+    tabs = 4
+    intervals = 5
+    ticks = sorted(
+        interval * interval_ms + tab * interval_ms // tabs
+        for interval in range(intervals)
+        for tab in range(tabs)
+    )
+
+    claimed = [t for t in ticks if dal.claim_heartbeat_window(db_path, "/app/", "alice", t, 3)]
+
+    assert claimed == [interval * interval_ms for interval in range(intervals)]
+    assert dal.get_suppressed_count(db_path, "/app/") == (tabs - 1) * intervals
+
+
+def test_apps_with_different_intervals_do_not_interfere(db_path):
+    now_ms = 1_700_000_000_000
+    assert dal.claim_heartbeat_window(db_path, "/b/", "alice", now_ms, 5)
+    assert dal.claim_heartbeat_window(db_path, "/c/", "alice", now_ms, 3)
+    assert not dal.claim_heartbeat_window(db_path, "/b/", "alice", now_ms, 5)
+
+
+def test_prune_only_removes_stale_claims_of_the_same_app(db_path):
+    start_ms = 1_700_000_000_000
+    later_ms = start_ms + (dal.DEDUPE_RETENTION_SECONDS + dal.DEDUPE_PRUNE_INTERVAL_SECONDS) * 1000
+
+    assert dal.claim_heartbeat_window(db_path, "/app/", "alice", start_ms, 3)
+    assert dal.claim_heartbeat_window(db_path, "/other/", "alice", start_ms, 3)
+    assert dal.claim_heartbeat_window(db_path, "/app/", "bob", later_ms, 3)
+
+    assert _count_claims(db_path, "/app/") == 1
+    assert _count_claims(db_path, "/other/") == 1
+
+
+def test_missing_username_is_sent_without_claiming(db_path, monkeypatch, capsys):
+    app = SimpleNamespace(config=SimpleNamespace(requests_pathname_prefix="/app/"))
+    posts = []
+    monkeypatch.setattr(dal.auth, "get_username", lambda: None)
+    monkeypatch.setattr(dal, "get_keycloak_tokens", lambda: {"access_token": "a", "id_token": "i"})
+    monkeypatch.setattr(
+        dal.requests, "post", lambda url, **kwargs: posts.append(kwargs["json"]) or SimpleNamespace(status_code=200)
+    )
+
+    dal._send_log_data(app, "https://example.invalid", 3, db_path)
+    dal._send_log_data(app, "https://example.invalid", 3, db_path)
+
+    assert len(posts) == 2
+    assert dal.get_suppressed_count(db_path, "/app/") == 0
+    assert _count_claims(db_path, "/app/") == 0
+    assert "Error" not in capsys.readouterr().out
+
+
+def test_released_window_can_be_claimed_again(db_path):
+    assert dal.claim_heartbeat_window(db_path, "/app/", "alice", 0, 3)
+    dal.release_heartbeat_window(db_path, "/app/", "alice", 0)
+    assert dal.claim_heartbeat_window(db_path, "/app/", "alice", 0, 3)
+
+
+def test_failed_send_releases_the_window(db_path, monkeypatch):
+    app = SimpleNamespace(config=SimpleNamespace(requests_pathname_prefix="/app/"))
+    monkeypatch.setattr(dal.auth, "get_username", lambda: "alice")
+    monkeypatch.setattr(dal, "get_keycloak_tokens", lambda: None)
+    monkeypatch.setattr(dal.time, "time", lambda: 100.0)
+
+    dal._send_log_data(app, "https://example.invalid", 3, db_path)
+
+    assert dal.claim_heartbeat_window(db_path, "/app/", "alice", 100_000, 3)
+    assert dal.get_suppressed_count(db_path, "/app/") == 0